@@ -13,6 +13,9 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/microsoft/waterfall_ax",
     packages=setuptools.find_packages(),
+    extras_require={
+        "pandas": ["pandas"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
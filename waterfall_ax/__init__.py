@@ -1 +1 @@
-from .waterfall_ax import WaterfallChart
\ No newline at end of file
+from .waterfall_ax import WaterfallChart, PlotData
\ No newline at end of file
@@ -1,6 +1,88 @@
-import pandas as pd
+from functools import lru_cache
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+# Available color controls and their default values, in the order returned by WaterfallChart.get_colors()
+_COLOR_DEFAULTS = (
+    ('c_bar_pos', 'seagreen'), # Bar color for positive deltas
+    ('c_bar_neg', 'salmon'), # Bar color for negative deltas
+    ('c_bar_start', 'c'), # Bar color for the very first bar
+    ('c_bar_end', 'grey'), # Bar color for the last bar
+    ('c_text_pos', 'darkgreen'), # Label text color for positive deltas
+    ('c_text_neg', 'maroon'), # Label text color for negative deltas
+    ('c_text_start', 'black'), # Label text color for the very first bar
+    ('c_text_end', 'black'), # Label text color for the last bar
+)
+_DEFAULT_COLORS = tuple(default for _, default in _COLOR_DEFAULTS)
+
+def _compute_waterfall(vals):
+    '''
+    Compute the cumulative values, deltas and bar bases (each of length N+1) from N cumulative step values.
+    '''
+    n = vals.shape[0]
+    # Cumulative values, with the final value appended
+    metric = np.empty(n+1)
+    metric[:-1] = vals
+    metric[-1] = vals[-1]
+    # Deltas between steps, with the first and the final value as they are
+    delta = np.empty(n+1)
+    delta[0] = vals[0]
+    delta[1:-1] = vals[1:] - vals[:-1]
+    delta[-1] = vals[-1]
+    # Base values: each bar starts from the previous cumulative value
+    base = np.empty(n+1)
+    base[0] = 0.0
+    base[1:-1] = vals[:-1]
+    base[-1] = 0.0
+    return metric, delta, base
+
+def _color_palette(*colors):
+    '''
+    Create an object array of colors, to be indexed with integer color codes.
+    The colors are assigned one by one so that RGB(A) tuples are kept as single values.
+    '''
+    palette = np.empty(len(colors), dtype=object)
+    for i, color in enumerate(colors):
+        palette[i] = color
+    return palette
+
+# Charts with more mid values than this skip the color cache: each entry holds O(N) key and result tuples
+_COLOR_CACHE_MAX_STEPS = 1000
+
+@lru_cache(maxsize=32)
+def _compute_color_lists(is_neg, colors):
+    '''
+    Create the bar and label colors from the signs of the mid deltas (a sequence of bools, True for negative;
+    a tuple when going through the cache) and the colors returned by WaterfallChart.get_colors().
+    Results are cached, so small charts sharing the same signs and palette reuse them.
+    '''
+    c_bar_pos, c_bar_neg, c_bar_start, c_bar_end, c_text_pos, c_text_neg, c_text_start, c_text_end = colors
+    # Color code of each mid value: 0 for positive deltas, 1 for negative deltas
+    idx = np.array(is_neg, dtype=np.int8)
+    bar_mid = _color_palette(c_bar_pos, c_bar_neg)[idx]
+    txt_mid = _color_palette(c_text_pos, c_text_neg)[idx]
+    barcolors = (c_bar_start, *bar_mid.tolist(), c_bar_end)
+    txtcolors = (c_text_start, *txt_mid.tolist(), c_text_end)
+    return barcolors, txtcolors
+
+class PlotData():
+
+    '''
+    The arrays needed to plot a waterfall chart, as returned by WaterfallChart.prep_plot().
+        index [list]: the label of each bar, including the final value.
+        metric [ndarray]: the cumulative value of each bar.
+        delta [ndarray]: the height of each bar.
+        base [ndarray]: the bottom of each bar.
+    '''
+
+    __slots__ = ('index', 'metric', 'delta', 'base')
+
+    def __init__(self, index, metric, delta, base):
+        self.index = index
+        self.metric = metric
+        self.delta = delta
+        self.base = base
 
 class WaterfallChart():
     
@@ -9,23 +91,23 @@ class WaterfallChart():
     The plot_waterfall() function returns an Axes object. So it’s very flexible to use the object outside the class for further editing.
     '''
 
-    def __init__(self, step_values, step_names=[], metric_name='', last_step_label=''):
+    def __init__(self, step_values, step_names=None, metric_name='', last_step_label=''):
         '''
         step_values [list]: the cumulative values for each step.
-        step_names [list]: (optional) the corresponding labels for each step. Default is []. If [], Labels will be assigned as 'Step_i' based on the order of step_values.
+        step_names [list]: (optional) the corresponding labels for each step. Default is None. If None or [], Labels will be assigned as 'Step_i' based on the order of step_values.
         metric_name [str]: (optional)  the metric label. Default is ''. If '', a label 'Value' will be assigned as metric name.
         last_step_label [str]: (optional) In the data pre-processing, an additional data point will be appended to reflect the final cumulative value. 
                                This is the label for that value. Default is ''. If '', the label will be assigned as 'Final Value'.
         '''
         self.step_values = step_values
-        self.step_names = step_names if len(step_names)>0 else ['Step_{0}'.format(x+1) for x in range(len(step_values))] 
+        self.step_names = step_names if step_names is not None and len(step_names)>0 else ['Step_{0}'.format(x+1) for x in range(len(step_values))]
         self.metric_col = metric_name if metric_name!='' else 'Value'
         self.delta_col = 'delta'
         self.base_col = 'base'        
         self.last_step_label = last_step_label if last_step_label!='' else 'Final Value'
         
     def plot_waterfall(self, ax=None, figsize=(10, 5), title='', bar_labels=True,
-                       color_kwargs={}, bar_kwargs={}, line_kwargs={}):
+                       color_kwargs=None, bar_kwargs=None, line_kwargs=None):
         '''
         Generate the waterfall chart and return the Axes object. 
         Parameters:
@@ -34,124 +116,191 @@ class WaterfallChart():
             title [string]: (optional) title of the Axes. Default is ''.
             bar_labels [bool|list|str]: (optional) what to show as bar labels on the plot. Refer to check_label_type() for details. 
                                         Default is True. If True, the metric values (deltas and final value) will be shown as labels.
-            color_kwargs [dict]: (optional) arguments to control the colors of the plot. Refer to get_colors() function for details. Default is {}.
-            bar_kwargs [dict]: (optional) arguments to control the bars on the plot. Valid values are any kwargs for matplotlib.pyplot.bar. Default is {}. 
-            line_kwargs [dict]: (optional) arguments to control the lines on the plot. Valid values are any kwargs for matplotlib.axes.Axes.plot. Default is {}.
+            color_kwargs [dict]: (optional) arguments to control the colors of the plot. Refer to get_colors() function for details. Default is None.
+            bar_kwargs [dict]: (optional) arguments to control the bars on the plot. Valid values are any kwargs for matplotlib.pyplot.bar. Default is None.
+            line_kwargs [dict]: (optional) arguments to control the lines on the plot. Valid values are any kwargs for matplotlib.collections.LineCollection. Default is None.
         '''
         # Prep data for plotting
-        df_plot = self.prep_plot()
+        plot_data = self.prep_plot()
         # Plot
         if ax is None:
             fig, ax = plt.subplots(figsize=figsize)
-        ax = self.plot_bars(ax, df_plot, color_kwargs, bar_kwargs)
-        ax = self.plot_link_lines(ax, df_plot, line_kwargs)
-        # Label
-        if bar_labels:
-            ax = self.add_labels(ax, df_plot, bar_labels, color_kwargs)
-        # Format
-        ax.set_xlim(-0.5, len(df_plot)-0.5)
-        ax.set_ylim(0, df_plot[self.metric_col].max()*1.1)
-        ax.set_ylabel(self.metric_col)
-        ax.set_title(title, fontsize=16)
+        ax = self._render(ax, plot_data, title, bar_labels, color_kwargs, bar_kwargs, line_kwargs)
         return ax
 
+    @classmethod
+    def plot_many(cls, series_list, ax, title='', bar_labels=True,
+                  color_kwargs=None, bar_kwargs=None, line_kwargs=None, **chart_kwargs):
+        '''
+        Generate one waterfall chart per series on the same Axes, clearing it between charts, and yield the Axes after each one.
+        Reusing one Axes avoids creating a new figure per chart, e.g. when saving many charts in a batch:
+            for ax in WaterfallChart.plot_many(series_list, ax):
+                ax.figure.savefig(...)
+        Parameters:
+            series_list [list]: the step_values of each chart.
+            ax [Axes]: existing axes, reused for every chart.
+            title, bar_labels, color_kwargs, bar_kwargs, line_kwargs: (optional) same as plot_waterfall(), shared by all charts.
+            chart_kwargs: (optional) other arguments for WaterfallChart(), e.g. step_names or metric_name, shared by all charts.
+        '''
+        for step_values in series_list:
+            ax.clear()
+            chart = cls(step_values, **chart_kwargs)
+            yield chart._render(ax, chart.prep_plot(), title, bar_labels, color_kwargs, bar_kwargs, line_kwargs)
+
     def prep_plot(self):
         '''
-        Take the input values and create a dataframe for plotting
+        Take the input values and create the PlotData arrays for plotting
+        '''
+        vals = np.ascontiguousarray(self.step_values, dtype=float)
+        if vals.size == 0:
+            raise ValueError('step_values must contain at least one value')
+        metric, deltas, base = _compute_waterfall(vals)
+        return PlotData(list(self.step_names) + [self.last_step_label], metric, deltas, base)
+
+    def prep_plot_df(self):
+        '''
+        Take the input values and create a dataframe for plotting, with the same data as prep_plot()
+        Requires pandas, which is only imported here so that plotting does not depend on it.
         '''
-        # Create a table for plotting
-        step_deltas = list(pd.Series(self.step_values).diff().fillna(pd.Series(self.step_values)).values)
+        import pandas as pd
+        plot_data = self.prep_plot()
         df_plot = pd.DataFrame(
-            [self.step_values+[self.step_values[-1]], step_deltas+[self.step_values[-1]]],
-            columns = self.step_names + [self.last_step_label], 
-            index = [self.metric_col, self.delta_col]).transpose()
-        # Add base values
-        df_plot[self.base_col] = df_plot[self.metric_col].shift(1).fillna(0)
-        df_plot[self.base_col] = list(df_plot[self.base_col].values[0:-1]) + [0]  
+            {self.metric_col: plot_data.metric, self.delta_col: plot_data.delta, self.base_col: plot_data.base},
+            index = plot_data.index)
         return df_plot
+
+    def _render(self, ax, plot_data, title, bar_labels, color_kwargs, bar_kwargs, line_kwargs):
+        '''
+        Plot the bars, lines and labels in a single pass, with the colors computed only once, then format the Axes
+        '''
+        barcolors, txtcolors = self.create_color_list(plot_data, color_kwargs)
+        self._draw_bars(ax, plot_data, barcolors, bar_kwargs)
+        self.plot_link_lines(ax, plot_data, line_kwargs)
+        if bar_labels:
+            labels = self.create_label_list(plot_data, bar_labels)
+            self._draw_labels(ax, plot_data, labels, txtcolors)
+        # Format
+        ax.set_xlim(-0.5, plot_data.metric.size-0.5)
+        ax.set_ylim(0, float(plot_data.metric.max())*1.1)
+        ax.set_ylabel(self.metric_col)
+        ax.set_title(title, fontsize=16)
+        return ax
     
-    def plot_bars(self, ax, df_plot, color_kwargs={}, bar_kwargs={}):
+    def plot_bars(self, ax, plot_data, color_kwargs=None, bar_kwargs=None):
         '''
         Plot the bar elements of the waterfall chart 
         Parameters:
             ax [Axes]: existing axes.
-            df_plot [DataFrame]: data to plot.
-            color_kwargs [dict]: (optional) arguments to control the colors of the plot. Default is {}
-            bar_kwargs [dict]: (optional) arguments to control the bars on the plot. Default is {}
+            plot_data [PlotData]: data to plot. Refer to prep_plot() for details.
+            color_kwargs [dict]: (optional) arguments to control the colors of the plot. Default is None
+            bar_kwargs [dict]: (optional) arguments to control the bars on the plot. Default is None
+        '''
+        barcolors, _ = self.create_color_list(plot_data, color_kwargs)
+        return self._draw_bars(ax, plot_data, barcolors, bar_kwargs)
+
+    @staticmethod
+    def _draw_bars(ax, plot_data, barcolors, bar_kwargs):
         '''
-        barcolors, _ = self.create_color_list(df_plot, color_kwargs)
-        bar_kwargs['width'] = bar_kwargs.get('width', 0.6)
-        ax.bar(x=df_plot.index, height=df_plot[self.delta_col], bottom=df_plot[self.base_col], color=barcolors, **bar_kwargs)
+        Draw the bars with precomputed bar colors
+        '''
+        # Default kwargs, without modifying the caller's dict
+        bar_kwargs = {'width': 0.6, **(bar_kwargs or {})}
+        ax.bar(x=plot_data.index, height=plot_data.delta, bottom=plot_data.base, color=barcolors, **bar_kwargs)
         return ax
     
-    def plot_link_lines(self, ax, df_plot, line_kwargs={}):
+    def plot_link_lines(self, ax, plot_data, line_kwargs=None):
         '''
         Plot the line elements of the waterfall chart 
         Parameters:
             ax [Axes]: existing axes.
-            df_plot [DataFrame]: data to plot.
-            line_kwargs [dict]: (optional) arguments to control the lines on the plot. Default is {}
-        '''
-        # Create lines
-        link_lines = df_plot[self.metric_col].repeat(3).shift(2)
-        link_lines[1:-1:3] = np.nan
-        link_lines = link_lines[1:-1]
-        # Default kwargs
-        line_kwargs['color'] = line_kwargs.get('color', 'grey')
-        line_kwargs['linestyle'] = line_kwargs.get('linestyle', '--')
-        # Plot
-        ax.plot(link_lines, **line_kwargs)
+            plot_data [PlotData]: data to plot. Refer to prep_plot() for details.
+            line_kwargs [dict]: (optional) arguments to control the lines on the plot. Default is None
+        '''
+        # Create lines: one segment from each bar to the next at the cumulative value
+        metric = plot_data.metric
+        n_links = len(metric) - 1
+        segments = np.empty((n_links, 2, 2))
+        segments[:, 0, 0] = np.arange(n_links)
+        segments[:, 1, 0] = segments[:, 0, 0] + 1
+        segments[:, :, 1] = metric[:-1, None]
+        # Default kwargs, without modifying the caller's dict
+        line_kwargs = {'color': 'grey', 'linestyle': '--', **(line_kwargs or {})}
+        # Plot all segments as a single collection
+        ax.add_collection(LineCollection(segments, **line_kwargs))
         return ax
 
-    def add_labels(self, ax, df_plot, bar_labels, color_kwargs={}):
+    def add_labels(self, ax, plot_data, bar_labels, color_kwargs=None):
         '''
         Add labels to the waterfall chart.
         Parameters:
             ax [Axes]: existing axes.
-            df_plot [DataFrame]: data to plot.
+            plot_data [PlotData]: data to plot. Refer to prep_plot() for details.
             bar_labels [bool|list|str]: what to show as bar labels on the plot. Refer to check_label_type() for details. 
-            color_kwargs [dict]: (optional) arguments to control the colors of the plot. Default is {}
+            color_kwargs [dict]: (optional) arguments to control the colors of the plot. Default is None
         '''
-        _, txtcolors = self.create_color_list(df_plot, color_kwargs)
-        label_type = self.check_label_type(bar_labels)
-        for i, v in enumerate(df_plot[self.metric_col]):
-            if label_type == 'list':
-                label = str(bar_labels[i])
-            elif label_type == 'value':
-                label = '{:,}'.format(int(df_plot[self.delta_col][i]))
-            else:
-                label = bar_labels
-            ax.text(i, v*1.02, label, color=txtcolors[i],  
+        _, txtcolors = self.create_color_list(plot_data, color_kwargs)
+        labels = self.create_label_list(plot_data, bar_labels)
+        return self._draw_labels(ax, plot_data, labels, txtcolors)
+
+    @staticmethod
+    def _draw_labels(ax, plot_data, labels, txtcolors):
+        '''
+        Draw the labels with precomputed label texts and colors
+        '''
+        # Label positions computed in one array operation, then read as Python floats
+        label_y = (plot_data.metric*1.02).tolist()
+        for i in range(len(label_y)):
+            # Labels sit inside the Axes, so keep them out of tight/constrained layout computations
+            ax.text(i, label_y[i], labels[i], color=txtcolors[i], in_layout=False,
                     horizontalalignment='center', verticalalignment='baseline')
         return ax
+
+    def create_label_list(self, plot_data, bar_labels):
+        '''
+        Create the list of label texts for the corresponding values to plot
+        Parameters:
+            plot_data [PlotData]: data to plot. Refer to prep_plot() for details.
+            bar_labels [bool|list|str]: what to show as bar labels on the plot. Refer to check_label_type() for details.
+        '''
+        # Select the label builder once for the label type
+        label_type = self.check_label_type(bar_labels)
+        create_labels = {
+            'list': lambda: [str(x) for x in bar_labels],
+            'value': lambda: [f'{int(x):,}' for x in plot_data.delta.tolist()],
+            'str': lambda: [bar_labels] * len(plot_data.index),
+        }[label_type]
+        return create_labels()
     
-    def create_color_list(self, df_plot, color_kwargs):
+    def create_color_list(self, plot_data, color_kwargs):
         '''
         Create the lists of colors (bar and label) for the corresponding values to plot
         Parameters:
-            df_plot [DataFrame]: data to plot.
-            color_kwargs [dict]: arguments to control the colors of the plot.
-        '''
-        c_bar_pos, c_bar_neg, c_bar_start, c_bar_end, c_text_pos, c_text_neg, c_text_start, c_text_end = self.get_colors(color_kwargs)
-        mid_values = df_plot[self.delta_col][1:-1].values
-        barcolors = [c_bar_start] + [c_bar_neg if x<0 else c_bar_pos for x in mid_values] + [c_bar_end]        
-        txtcolors = [c_text_start] + [c_text_neg if x<0 else c_text_pos for x in mid_values] + [c_text_end]
-        return barcolors, txtcolors
+            plot_data [PlotData]: data to plot. Refer to prep_plot() for details.
+            color_kwargs [dict]: arguments to control the colors of the plot. None or {} means the default colors.
+        '''
+        colors = self.get_colors(color_kwargs)
+        is_neg = plot_data.delta[1:-1] < 0
+        if is_neg.size > _COLOR_CACHE_MAX_STEPS:
+            # Large charts: compute directly rather than hold and rebuild O(N) cache keys
+            barcolors, txtcolors = _compute_color_lists.__wrapped__(is_neg, colors)
+        else:
+            try:
+                barcolors, txtcolors = _compute_color_lists(tuple(is_neg.tolist()), colors)
+            except TypeError:
+                # Unhashable color values (e.g. lists), skip the cache
+                barcolors, txtcolors = _compute_color_lists.__wrapped__(is_neg, colors)
+        return list(barcolors), list(txtcolors)
         
     @staticmethod
     def get_colors(color_kwargs):
         '''
-        Available color controls and their default values.
-        '''
-        c_bar_pos = color_kwargs.get('c_bar_pos', 'seagreen') # Bar color for positive deltas
-        c_bar_neg = color_kwargs.get('c_bar_neg', 'salmon') # Bar color for negative deltas
-        c_bar_start = color_kwargs.get('c_bar_start', 'c') # Bar color for the very first bar
-        c_bar_end = color_kwargs.get('c_bar_end', 'grey') # Bar color for the last bar
-        c_text_pos = color_kwargs.get('c_text_pos', 'darkgreen') # Label text color for positive deltas
-        c_text_neg = color_kwargs.get('c_text_neg', 'maroon') # Label text color for negative deltas
-        c_text_start = color_kwargs.get('c_text_start', 'black') # Label text color for the very first bar
-        c_text_end = color_kwargs.get('c_text_end', 'black') # Label text color for the last bar
-        return c_bar_pos, c_bar_neg, c_bar_start, c_bar_end, c_text_pos, c_text_neg, c_text_start, c_text_end
+        Resolve the colors to use. Available color controls and their default values are listed in _COLOR_DEFAULTS.
+        Returns c_bar_pos, c_bar_neg, c_bar_start, c_bar_end, c_text_pos, c_text_neg, c_text_start, c_text_end.
+        '''
+        # Common case: no overrides, so return the precomputed defaults
+        if not color_kwargs:
+            return _DEFAULT_COLORS
+        return tuple(color_kwargs.get(key, default) for key, default in _COLOR_DEFAULTS)
     
     @staticmethod
     def check_label_type(bar_labels):